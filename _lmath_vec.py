@@ -0,0 +1,61 @@
+""" NumPy (and, when installed, Numba) implementations behind the lmath.*_vec functions.
+This is imported by lmath only on the first *_vec call, so that `import lmath` stays free of these dependencies. """
+import math
+
+import numpy as np
+
+from lmath import _INV_SQRT2, _SQRT_TAU
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """ Stand-in for numba.njit when Numba is not installed: leave the decorated function as plain Python. """
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _distance(p, q):
+    d = p - q
+    return np.sqrt((d * d).sum(axis=1))
+
+
+@njit(cache=True, fastmath=True)
+def _normdist_pdf(x, mu, sigma):
+    z = (x - mu) / sigma
+    return np.exp(-0.5 * z * z) / (sigma * _SQRT_TAU)
+
+
+@njit(cache=True, fastmath=True)
+def _normdist_cdf(x, mu, sigma):
+    # NumPy has no erf, so evaluate math.erf elementwise (compiled to a tight loop under Numba)
+    out = np.empty_like(x)
+    for i in range(x.size):
+        out[i] = 0.5 + 0.5 * math.erf((x[i] - mu) / sigma * _INV_SQRT2)
+    return out
+
+
+def distance_vec(p, q) -> np.ndarray:
+    p = np.atleast_2d(np.asarray(p, dtype=np.float64))
+    q = np.atleast_2d(np.asarray(q, dtype=np.float64))
+
+    # as in lmath.distance, right-pad the lower-dimensional points with zeros
+    pad = p.shape[1] - q.shape[1]
+    if pad > 0:
+        q = np.pad(q, ((0, 0), (0, pad)))
+    elif pad < 0:
+        p = np.pad(p, ((0, 0), (0, -pad)))
+
+    return _distance(p, q)
+
+
+# the kernels work on 1D arrays; the wrappers restore x's shape (so a 0-d x gives a 0-d array back)
+
+def normdist_pdf_vec(x, mu, sigma) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return _normdist_pdf(x.ravel(), float(mu), float(sigma)).reshape(x.shape)
+
+
+def normdist_cdf_vec(x, mu, sigma) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return _normdist_cdf(x.ravel(), float(mu), float(sigma)).reshape(x.shape)
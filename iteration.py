@@ -2,19 +2,53 @@ import collections
 import itertools
 import operator
 import sys
-from typing import Callable, Generic, Iterable, Optional, Tuple, TypeVar
+from typing import Callable, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
 
 T = TypeVar('T')
 R = TypeVar('R')
 
+# sources which can be iterated more than once on their own, and so can be stored directly
+_REITERABLE = (list, tuple, range, bytes, str, set, frozenset, dict)
+
+# reiterable sources which also support indexing and slicing
+_SEQUENCES = (list, tuple, range, bytes, str)
+
+# sources whose own `in` agrees with checking each element in turn
+# (not str/bytes, since there `in` tests for substrings)
+_CONTAINERS = (list, tuple, range, set, frozenset, dict)
+
+# default for next() that no item can be, to detect an exhausted iterator
+_SENTINEL = object()
+
+
+def _is_islice_arg(value: Optional[int]) -> bool:
+    """ Return True if value is accepted by itertools.islice (and so slices a sequence the same way). """
+    return value is None or (isinstance(value, int) and value >= 0)
+
+
+if sys.version_info >= (3, 8):
+    _accumulate = itertools.accumulate
+else:
+    def _accumulate(
+        iterable: Iterable[T], func: Callable[[T, T], T] = operator.add,
+        *, initial: Optional[T] = None
+    ) -> Iterator[T]:
+        # itertools.accumulate only gained `initial` in Python 3.8, so handle it manually
+        if initial is not None:
+            iterable = itertools.chain((initial,), iterable)
+
+        return itertools.accumulate(iterable, func)
+
 
 class LazyIterable(Generic[T]):
     """ Create a lazily-evaluated iterable, bridging the gap between an iterable and an iterator.
     LazyIterable objects have higher overhead than generators, but far less than storing all of their
     items in memory (like a list). They also have the benefit of being iterable more than once. """
 
+    __slots__ = ('_source', '_is_reiterable')
+
     def __init__(self, items: Optional[Iterable[T]] = None):
-        self._items, self.reserve = None, None
+        self._source, self._is_reiterable = (), True
 
         if items:
             self.update(items)
@@ -23,15 +57,7 @@ class LazyIterable(Generic[T]):
         self, accumulator: Callable[[T, T], T] = operator.add,
         *, initial: Optional[T] = None
     ) -> 'LazyIterable[T]':
-        if sys.version_info >= (3, 8):
-            items = itertools.accumulate(iter(self), accumulator, initial=initial)
-        else:
-            # manually handle initial value
-            items = itertools.accumulate(
-                itertools.chain((initial,), iter(self)),
-                accumulator
-            )
-
+        items = _accumulate(iter(self), accumulator, initial=initial)
         return self.__class__(items)
 
     def append(self, item: T):
@@ -41,7 +67,9 @@ class LazyIterable(Generic[T]):
     def combinations(self, r: int, replacement: bool = False) -> 'LazyIterable[Tuple[T]]':
         """ Return length-r subsequences of elements from the LazyIterable. """
         func = itertools.combinations_with_replacement if replacement else itertools.combinations
-        items = func(iter(self))
+        # itertools.combinations reads its whole input up front anyway, so keep that copy for reuse
+        # (unless the source is already reiterable, in which case it is passed as it is)
+        items = func(self._source if self._is_reiterable else self.materialize(), r)
 
         return self.__class__(items)
 
@@ -85,48 +113,80 @@ class LazyIterable(Generic[T]):
 
     def get_at(self, index: int, default: Optional[T] = None) -> T:
         """ Return the value at position #index, or default. """
+        if isinstance(self._source, _SEQUENCES) and isinstance(index, int) and index >= 0:
+            return self._source[index] if index < len(self._source) else default
+
         s = itertools.islice(iter(self), index, None)
         return next(s, default)
 
     def get_slice(self, *args: int) -> 'LazyIterable[T]':
         """ Return items over a range. """
+        if isinstance(self._source, _SEQUENCES):
+            s = slice(*args)
+            if all(map(_is_islice_arg, (s.start, s.stop, s.step))) and s.step != 0:
+                # slice the sequence directly (which gives another reiterable sequence)
+                return self.__class__(self._source[s])
+
         items = itertools.islice(iter(self), *args)
         return self.__class__(items)
 
     def head(self, n: int) -> 'LazyIterable[T]':
         """ Return the first n items of the iterable """
-        return self.get_slice(n)
+        if isinstance(self._source, _SEQUENCES):
+            return self.get_slice(n)
+
+        items = tuple(itertools.islice(iter(self), n))
+        return self.__class__(items)
 
     def insert(self, index: int, item: T):
         """ Insert the item at the given index. """
-        items = self.get_slice(index) + [item] + self.get_slice(index, None)
+        items = itertools.chain(
+            itertools.islice(iter(self), index),
+            (item,),
+            itertools.islice(iter(self), index, None)
+        )
         self.update(items)
 
     def length(self, cap: Optional[int] = None) -> int:
         if cap is None:
             return len(self)
 
-        i = iter(self)
-        for k in range(cap):
-            try:
-                next(i)
-            except StopIteration:
-                return k
-        return cap
+        # validate here so that both paths below treat cap the same way
+        if not isinstance(cap, int):
+            raise TypeError(f'cap must be an int or None, not {type(cap).__name__}')
+        if cap < 0:
+            raise ValueError(f'cap must be non-negative, not {cap}')
+
+        if self._is_reiterable:
+            return min(len(self._source), cap)
+
+        return sum(1 for _ in itertools.islice(iter(self), cap))
+
+    def materialize(self) -> Tuple[T, ...]:
+        """ Evaluate every item of the iterable, keeping them as the (tuple) source for later iterations. """
+        if self._is_reiterable:
+            # leave the existing container in place (e.g. a set keeps its O(1) `in`, a range its O(1) size)
+            return self._source if isinstance(self._source, tuple) else tuple(self._source)
+
+        self._source, self._is_reiterable = tuple(iter(self)), True
+        return self._source
 
     def permutations(self, r: Optional[int] = None) -> 'LazyIterable[Tuple[T]]':
         """ Return length-r permutations """
-        items = itertools.permutations(iter(self))
+        items = itertools.permutations(self._source if self._is_reiterable else self.materialize(), r)
         return self.__class__(items)
 
     def prepend(self, item: T):
         """ Add the element to the start of this iterable """
-        items = [item] + self
+        items = itertools.chain((item,), iter(self))
         self.update(items)
 
     def tail(self, n: int) -> 'LazyIterable[T]':
         """ Return the last n items """
-        items = collections.deque(self, maxlen=n)
+        if isinstance(self._source, _SEQUENCES) and isinstance(n, int) and n >= 0:
+            return self.__class__(self._source[max(len(self._source) - n, 0):])
+
+        items = tuple(collections.deque(iter(self), maxlen=n))
         return self.__class__(items)
 
     def takewhile(self, key: Callable[[T], bool] = bool) -> 'LazyIterable[T]':
@@ -136,7 +196,12 @@ class LazyIterable(Generic[T]):
 
     def update(self, items: Iterable[T]):
         """ Set the item pointer to this new iterable of items """
-        self._items, self._reserve = itertools.tee(items, 2)
+        if isinstance(items, _REITERABLE):
+            # already safe to iterate more than once, so no buffering is needed
+            self._source, self._is_reiterable = items, True
+        else:
+            # __iter__ wraps this in a tee on the first pass, and copies that tee for each later pass
+            self._source, self._is_reiterable = iter(items), False
 
     def __add__(self, other: Iterable[T]) -> 'LazyIterable[T]':
         """ Return a new LazyIterable whose contents are the chain of left and right """
@@ -154,23 +219,34 @@ class LazyIterable(Generic[T]):
         return self
 
     def __len__(self) -> int:
-        i = iter(self)
-        for k in itertools.count():
-            try:
-                next(i)
-            except StopIteration:
-                return k
+        if self._is_reiterable:
+            return len(self._source)
+
+        # every item has to be evaluated anyway, so keep them (and the length) for later
+        return len(self.materialize())
 
-    def __iter__(self):
-        i = iter(self._items)
-        self.update(self._reserve)
+    def __iter__(self) -> Iterator[T]:
+        if self._is_reiterable:
+            return iter(self._source)
 
-        return i
+        # copying a tee is cheap: the copies share one underlying buffer
+        self._source, items = itertools.tee(self._source, 2)
+        return items
 
     def __contains__(self, value: T) -> bool:
         """ Return True if value is in this LazyIterable; False otherwise. """
+        if self._is_reiterable and isinstance(self._source, _CONTAINERS):
+            try:
+                return value in self._source
+            except TypeError:
+                # unhashable value checked against a set/dict: fall back to comparing elements
+                pass
+
         return value in iter(self)
 
     def __bool__(self) -> bool:
         """ Return True if nonempty. """
-        return self.length(cap=1) == 1
+        if self._is_reiterable:
+            return bool(self._source)
+
+        return next(iter(self), _SENTINEL) is not _SENTINEL
@@ -2,11 +2,14 @@ import cmath
 import collections
 import contextlib
 import functools
-import itertools
 import math
 from numbers import Complex, Integral, Real
 import sys
-from typing import Any, Callable, Iterable, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    # only for the *_vec annotations; NumPy is imported at runtime on first use (see _vec_module)
+    import numpy as np
 
 
 # Expose constants from `math` and `cmath` modules, using uppercase identifiers to mark them as constant.
@@ -27,22 +30,28 @@ def ceil(x: Real) -> Integral:
     return math.ceil(x)
 
 
-def choose(n: int, k: int) -> int:
-    """ Return the number of ways to choose k items from n without repetition and without order. """
-    if sys.version_info >= (3, 8):
-        return math.comb(n, k)
+# math.comb, math.perm were added in Python 3.8 and math.lcm (plus multi-argument math.gcd) in Python 3.9.
+# Check the version once, here, and only define our own implementations where the stdlib ones are missing.
+# choose and permutations keep thin wrappers so that they still accept keyword arguments (math.comb and
+# math.perm are positional-only); gcd and lcm take only *values, so they can be bound directly.
 
-    # math.comb was only added in Python 3.8, so if we aren't running 3.8+, we'll have to write the function ourselves
-    if n < 0:
-        raise ValueError('n must be a non-negative integer')
+if sys.version_info >= (3, 8):
+    def choose(n: int, k: int) -> int:
+        """ Return the number of ways to choose k items from n without repetition and without order. """
+        return math.comb(n, k)
+else:
+    def choose(n: int, k: int) -> int:
+        """ Return the number of ways to choose k items from n without repetition and without order. """
+        if n < 0:
+            raise ValueError('n must be a non-negative integer')
 
-    if k < 0:
-        raise ValueError('k must be a non-negative integer')
+        if k < 0:
+            raise ValueError('k must be a non-negative integer')
 
-    if k > n:
-        return 0
+        if k > n:
+            return 0
 
-    return factorial(n) / factorial(k) / factorial(n - k)
+        return factorial(n) // factorial(k) // factorial(n - k)
 
 
 def factorial(x: Union[int, float]) -> int:
@@ -59,88 +68,83 @@ def floor(x: Real) -> Integral:
     return math.floor(x)
 
 
-def gcd(*values: int) -> int:
-    """ Return the greatest common divisor of the specified integer arguments. """
-    if sys.version_info >= (3, 9):
-        return math.gcd(*values)
-
-    # In 3.9+, math.gcd allows arbitrarily many arguments. Pre-3.9, it expects exactly two.
-    if len(values) == 0:
-        return 0
-
-    if len(values) == 1:
-        # abs since gcd > 0
-        return abs(values[0])
-
-    if len(values) == 2:
-        return math.gcd(*values)
-
-    # with n > 2 arguments, we can recurse this to (n - 1) arguments by taking the gcd of the first two in their place
-    a, b, *values = values
-    return gcd(gcd(a, b), *values)
+if sys.version_info >= (3, 9):
+    gcd = math.gcd
+else:
+    def gcd(*values: int) -> int:
+        """ Return the greatest common divisor of the specified integer arguments. """
+        # Pre-3.9, math.gcd expects exactly two arguments, so fold it over the values.
+        # gcd(0, x) == |x|, so starting from 0 also covers the zero- and one-argument cases.
+        return functools.reduce(math.gcd, values, 0)
 
 
-def lcm(*values: int) -> int:
-    """ Return the least common multiple of the specified integer arguments. """
-    if sys.version_info >= (3, 9):
-        return math.lcm(*values)
+if sys.version_info >= (3, 9):
+    lcm = math.lcm
+else:
+    def _lcm2(a: int, b: int) -> int:
+        # lcm(a, b) = |ab| / gcd(a, b), with the result being 0 if either is 0
+        return abs(a * b) // math.gcd(a, b) if a and b else 0
 
-    # math.lcm was only added in Python 3.9.
+    def lcm(*values: int) -> int:
+        """ Return the least common multiple of the specified integer arguments. """
+        if not all(isinstance(v, int) for v in values):
+            raise TypeError('lcm() only accepts integer values')
 
-    if not all(isinstance(v, int) for v in values):
-        raise TypeError('lcm() only accepts integer values')
+        # lcm(1, x) == |x|, so starting from 1 also covers the zero- and one-argument cases.
+        return functools.reduce(_lcm2, values, 1)
 
-    if len(values) == 0:
-        return 1
 
-    if len(values) == 1:
-        # abs since lcm > 0
-        return abs(values[0])
-
-    if len(values) == 2:
-        # lcm(a, b) = |ab| / gcd(a, b)
-        a, b = values
-        return abs(a * b) // gcd(a, b)
-
-    # with n > 2 arguments, we can recurse this to (n - 1) by taking the lcm of the first two in their place
-    a, b, *values = values
-    return lcm(lcm(a, b), *values)
+ModF = collections.namedtuple('ModF', ('fpart', 'ipart'))
 
 
 def modf(x: Real) -> Tuple[float, int]:
     """ Return the fractional and integer parts of x. """
-    ModF = collections.namedtuple('ModF', ('fpart', 'ipart'))
-
     f, i = math.modf(x)
     return ModF(fpart=f, ipart=int(i))
 
 
-def permutations(n: int, k: Optional[int] = None) -> int:
-    """ Return the number of ways k items can be chosen from n without repetition but with order. """
-    if sys.version_info >= (3, 8):
+if sys.version_info >= (3, 8):
+    def permutations(n: int, k: Optional[int] = None) -> int:
+        """ Return the number of ways k items can be chosen from n without repetition but with order. """
         return math.perm(n, k)
+else:
+    def permutations(n: int, k: Optional[int] = None) -> int:
+        """ Return the number of ways k items can be chosen from n without repetition but with order. """
+        if k is None:
+            k = n
 
-    # math.perm was only added in Python 3.8.
-    if n < 0 or not isinstance(n, int):
-        raise ValueError('n must be a non-negative integer')
+        if n < 0 or not isinstance(n, int):
+            raise ValueError('n must be a non-negative integer')
 
-    if k < 0 or not isinstance(k, int):
-        raise ValueError('k must be a non-negative integer')
+        if k < 0 or not isinstance(k, int):
+            raise ValueError('k must be a non-negative integer')
 
-    if k > n:
-        return 0
+        if k > n:
+            return 0
 
-    return factorial(n) / factorial(n - k)
+        return factorial(n) // factorial(n - k)
 
 # Complex representation functions
 
 
-def realcast(func: Callable[..., Complex], tol: float = 1e-12) -> Callable[..., Union[Real, Complex]]:
+_REALCAST_TOL = 1e-12
+
+
+def _cast_real(z: Complex, tol: float = _REALCAST_TOL) -> Union[Real, Complex]:
+    """ Return the real part of z if its imaginary part is sufficiently small, and z itself otherwise. """
+    # equivalent to cmath.isclose(z.imag, 0.0, abs_tol=tol), but cheaper
+    if -tol <= z.imag <= tol:
+        return z.real
+    return z
+
+
+def realcast(func: Callable[..., Complex], tol: float = _REALCAST_TOL) -> Callable[..., Union[Real, Complex]]:
     """ A decorator to cast the output of the function as real when its imaginary part is sufficiently small. """
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
         z = func(*args, **kwargs)
-        if cmath.isclose(z.imag, 0.0, abs_tol=tol):
+        # the same test as _cast_real, inlined since this wraps every trig/exp/sqrt call
+        if -tol <= z.imag <= tol:
             return z.real
         return z
 
@@ -165,10 +169,11 @@ def phase(z: Complex) -> float:
     return _phase(z)
 
 
+Polar = collections.namedtuple('Polar', ('modulus', 'phase'))
+
+
 def polar(z: Complex) -> Tuple[float, float]:
     """ Return the polar representation of z as the pair (r, phi). """
-    Polar = collections.namedtuple('Polar', ('modulus', 'phase'))
-
     return Polar(modulus=abs(z), phase=phase(z))
 
 
@@ -176,16 +181,29 @@ def polar(z: Complex) -> Tuple[float, float]:
 
 ANGLE_MODE: str = "RADIANS"
 
+_ANGLE_MODES = ('RADIANS', 'DEGREES')
+
+
+def _canonical_angle_mode(mode: str) -> str:
+    """ Return the given angle mode in uppercase, raising ValueError if it is not a valid mode. """
+    canonical = mode.upper()
+    if canonical not in _ANGLE_MODES:
+        raise ValueError(f'ANGLE_MODE must be one of "RADIANS" and "DEGREES", not {mode}')
+
+    return canonical
+
 
 @contextlib.contextmanager
 def force_angle_mode(temp_mode: str):
     """ A context manager that locally overrides the angle mode to be the given mode. """
     global ANGLE_MODE
 
+    # validate here, once, so that the trig functions themselves only need a plain comparison
+    canonical = _canonical_angle_mode(temp_mode)
     original = ANGLE_MODE
 
     try:
-        ANGLE_MODE = temp_mode
+        ANGLE_MODE = canonical
         yield
     finally:
         ANGLE_MODE = original
@@ -195,15 +213,20 @@ def force_angle_mode(temp_mode: str):
 fam = force_angle_mode
 
 
+_DEG2RAD = PI / 180
+
+
 def accept_angle(func: Callable[[Real], Any]) -> Callable[[Real], Any]:
     """ A decorator that uses ANGLE_MODE to parse its input angle in degrees or in radian. """
     @functools.wraps(func)
     def wrapped(theta):
-        if ANGLE_MODE.upper() not in {'RADIANS', 'DEGREES'}:
-            raise ValueError(f'ANGLE_MODE must be one of "RADIANS" and "DEGREES", not {ANGLE_MODE}')
+        mode = ANGLE_MODE
+        if mode != 'RADIANS' and mode != 'DEGREES':
+            # ANGLE_MODE was assigned directly, so it may need normalizing
+            mode = _canonical_angle_mode(mode)
 
-        if ANGLE_MODE.upper() == 'DEGREES':
-            theta *= PI / 180
+        if mode == 'DEGREES':
+            theta *= _DEG2RAD
 
         return func(theta)
 
@@ -214,12 +237,15 @@ def output_angle(func: Callable[..., Real]) -> Callable[..., Real]:
     """ A decorator that uses ANGLE_MODE to parse its output angle in degrees or in radians. """
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
-        if ANGLE_MODE.upper() not in {'RADIANS', 'DEGREES'}:
-            raise ValueError(f'ANGLE_MODE must be one of "RADIANS" and "DEGREES", not {ANGLE_MODE}')
+        mode = ANGLE_MODE
+        if mode != 'RADIANS' and mode != 'DEGREES':
+            # ANGLE_MODE was assigned directly, so it may need normalizing
+            mode = _canonical_angle_mode(mode)
 
         theta = func(*args, **kwargs)
 
-        if ANGLE_MODE.upper() == 'DEGREES':
+        if mode == 'DEGREES':
+            # not theta * (180 / PI), which rounds differently
             return theta * 180 / PI
         return theta
     return wrapped
@@ -251,10 +277,26 @@ sin = realcast(accept_angle(cmath.sin))
 tan = realcast(accept_angle(cmath.tan))
 
 
+if sys.version_info >= (3, 8):
+    _dist = math.dist
+else:
+    def _dist(p: Tuple[Real, ...], q: Tuple[Real, ...]) -> float:
+        distsqr = sum((px - qx) * (px - qx) for px, qx in zip(p, q))
+        return math.sqrt(distsqr)
+
+
 def distance(p: Iterable[Real], q: Iterable[Real]) -> float:
     """ Return the distance between points p and q in R² space. """
-    distsqr = sum(pow(px - qx, 2.0) for px, qx in itertools.zip_longest(p, q, fillvalue=0))
-    return sqrt(distsqr)
+    p, q = tuple(p), tuple(q)
+
+    # math.dist requires points of equal dimension, so right-pad the shorter with zeros
+    pad = len(p) - len(q)
+    if pad > 0:
+        q += (0,) * pad
+    elif pad < 0:
+        p += (0,) * -pad
+
+    return _dist(p, q)
 
 
 # Hyperbolic trig functions
@@ -270,12 +312,18 @@ tanh = realcast(accept_angle(cmath.tanh))
 
 # Power and logarithmic functions
 
-@realcast
+_complex_exp = realcast(cmath.exp)
+
+
 def exp(z: Complex) -> Union[Real, Complex]:
     """ Return e**x, where e = 2.718... is Euler's constant.
     This is usually more precise than E**z or pow(E, z).
     """
-    return cmath.exp(z)
+    if isinstance(z, Real):
+        # the result is necessarily real, so skip the complex calculation
+        return math.exp(z)
+
+    return _complex_exp(z)
 
 
 def expm1(x: Real) -> Real:
@@ -318,17 +366,53 @@ def roots_of_unity(n: int) -> Tuple[Complex]:
     if not isinstance(n, int):
         raise TypeError('nth roots of unity: n must be a positive integer')
 
-    with force_angle_mode('radians'):
-        return tuple(
-            cartesian(modulus=1, phase=i*2*PI/n)
-            for i in range(n)
-        )
+    # call cmath.rect directly (it always works in radians) rather than going through cartesian's wrapper for each root
+    step = TAU / n
+    roots = (cmath.rect(1.0, i * step) for i in range(n))
+
+    # cast to real where possible, as cartesian would
+    return tuple(map(_cast_real, roots))
+
+
+_complex_sqrt = realcast(cmath.sqrt)
+
+# ints above this cannot all be represented exactly as floats
+_MAX_EXACT_INT = 2 ** 53
+
+# ints above this can overflow when converted to a float
+_MAX_FLOAT_INT = int(sys.float_info.max)
+
+if sys.version_info >= (3, 8):
+    _isqrt = math.isqrt
+else:
+    def _isqrt(n: int) -> int:
+        # Newton's method on integers, starting from a power of two above the root
+        x = 1 << ((n.bit_length() + 1) // 2)
+        while True:
+            y = (x + n // x) // 2
+            if y >= x:
+                return x
+            x = y
 
 
-@realcast
 def sqrt(z: Complex) -> Union[Real, Complex]:
     """ Return the square root of z. """
-    return cmath.sqrt(z)
+    if isinstance(z, Real) and z >= 0:
+        if isinstance(z, int) and z > _MAX_EXACT_INT:
+            # float(z) is inexact here (and overflows past the largest float), but isqrt is exact at any size.
+            # Perfect squares are rooted exactly; past the float range, the root is at least 2**512,
+            # so dropping its fractional part does not affect the nearest float.
+            r = _isqrt(z)
+            if r * r == z or z > _MAX_FLOAT_INT:
+                try:
+                    return float(r)
+                except OverflowError:
+                    raise OverflowError('sqrt(): result too large to represent as a float') from None
+
+        # the result is necessarily real, so skip the complex calculation
+        return math.sqrt(z)
+
+    return _complex_sqrt(z)
 
 
 # Special functions
@@ -339,16 +423,49 @@ erfc = math.erfc
 gamma = math.gamma
 
 
+_SQRT_TAU = math.sqrt(TAU)
+_INV_SQRT2 = 1 / math.sqrt(2)
+
+
 def normdist_pdf(x: Real, mu: Real = 0.0, sigma: Real = 1.0) -> Real:
     """ Return the probability density function for the normal distribution at x. """
-    k = sigma * sqrt(2 * PI)
     z = (x - mu) / sigma
 
-    return exp(-0.5 * z ** 2) / k
+    return math.exp(-0.5 * z * z) / (sigma * _SQRT_TAU)
 
 
 def normdist_cdf(x: Real, mu: Real = 0.0, sigma: Real = 1.0) -> Real:
     """ Return the CDF for the normal distribution at x. """
     z = (x - mu) / sigma
 
-    return 0.5 + 0.5 * erf(z / sqrt(2))
+    return 0.5 + 0.5 * math.erf(z * _INV_SQRT2)
+
+
+# Vectorized functions (require NumPy; compiled with Numba when it is installed)
+# The implementations live in _lmath_vec, which is only imported on the first call, so that importing lmath
+# never pulls in NumPy or Numba.
+
+def _vec_module(name: str):
+    try:
+        import _lmath_vec
+    except ModuleNotFoundError as e:
+        if e.name == 'numpy':
+            raise ImportError(f'{name}() requires numpy') from None
+        raise
+
+    return _lmath_vec
+
+
+def distance_vec(p: Iterable[Iterable[Real]], q: Iterable[Iterable[Real]]) -> 'np.ndarray':
+    """ Return the distances between corresponding points (rows) of p and q, as an array. """
+    return _vec_module('distance_vec').distance_vec(p, q)
+
+
+def normdist_pdf_vec(x: Iterable[Real], mu: Real = 0.0, sigma: Real = 1.0) -> 'np.ndarray':
+    """ Return the probability density function for the normal distribution at each element of x, as an array. """
+    return _vec_module('normdist_pdf_vec').normdist_pdf_vec(x, mu, sigma)
+
+
+def normdist_cdf_vec(x: Iterable[Real], mu: Real = 0.0, sigma: Real = 1.0) -> 'np.ndarray':
+    """ Return the CDF for the normal distribution at each element of x, as an array. """
+    return _vec_module('normdist_cdf_vec').normdist_cdf_vec(x, mu, sigma)